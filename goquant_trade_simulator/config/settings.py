@@ -21,6 +21,9 @@ VOLUME_DISCOUNTS = {
     100_000: 0.1,    # 10% discount for > $100K
 }
 
+# Discount tiers sorted by threshold, largest first
+VOLUME_DISCOUNTS_SORTED = tuple(sorted(VOLUME_DISCOUNTS.items(), reverse=True))
+
 # Market Impact Model Parameters
 MARKET_IMPACT_PARAMS = {
     'gamma': 0.314,  # Market response parameter
@@ -31,5 +34,4 @@ MARKET_IMPACT_PARAMS = {
 # Maker/Taker Ratio Parameters
 MAKER_TAKER_PARAMS = {
     'k': 4.0,        # Steepness parameter
-    'x0': 0.0,       # Midpoint parameter
 } 
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""
+Selects the kernel implementation used by the simulator.
+
+The ahead-of-time build from kernels_build.py is used only when it was
+compiled from the current kernels.py and settings; a missing or stale build
+falls back to the JIT-compiled ``simulator.kernels``.
+"""
+import warnings
+from .kernel_stamp import source_stamp
+
+def _load():
+    try:
+        from . import _kernels
+    except ImportError:
+        _kernels = None
+    
+    if _kernels is not None:
+        # Builds from before the stamp was added have no source_stamp export
+        build_stamp = getattr(_kernels, "source_stamp", None)
+        if build_stamp is not None and build_stamp() == source_stamp():
+            return _kernels
+        warnings.warn(
+            f"{_kernels.__file__} is out of date with simulator/kernels.py or config/settings.py; "
+            "using the JIT kernels instead. Rebuild it with `python -m simulator.kernels_build`."
+        )
+    
+    from . import kernels
+    return kernels
+
+kernels = _load()
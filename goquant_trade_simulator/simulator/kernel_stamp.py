@@ -0,0 +1,23 @@
+"""
+Stamp identifying the sources compiled into the Numba kernels.
+
+Kept free of import-time side effects so kernels_build.py can use it
+without loading the (possibly stale) ahead-of-time build it replaces.
+"""
+import hashlib
+import os
+from config import settings
+
+# Sources whose contents are compiled into the kernels (settings are frozen as constants)
+_KERNEL_SOURCES = (
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "kernels.py"),
+    os.path.abspath(settings.__file__),
+)
+
+def source_stamp():
+    """Hash of the kernel sources, as a non-negative int64 for the AOT build to embed"""
+    digest = hashlib.sha256()
+    for path in _KERNEL_SOURCES:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return int(digest.hexdigest()[:15], 16)
@@ -0,0 +1,250 @@
+"""
+Numba kernels for the order book hot paths.
+"""
+from math import exp, sqrt
+
+import numpy as np
+from numba import njit, types
+from config.settings import (
+    MAKER_FEE, TAKER_FEE, VOLUME_DISCOUNTS_SORTED,
+    MARKET_IMPACT_PARAMS, MAKER_TAKER_PARAMS
+)
+
+# Model parameters as plain globals so Numba freezes them as constants
+_SLIPPAGE_ALPHA = 0.0001  # Base slippage component (0.01%)
+_SLIPPAGE_BETA = 0.02     # Volume coefficient
+_AC_GAMMA = MARKET_IMPACT_PARAMS['gamma']
+_AC_ALPHA = MARKET_IMPACT_PARAMS['alpha']
+_MT_K = MAKER_TAKER_PARAMS['k']
+_DISCOUNT_THRESHOLDS = np.array([t for t, _ in VOLUME_DISCOUNTS_SORTED], dtype=np.float64)
+_DISCOUNT_RATES = np.array([d for _, d in VOLUME_DISCOUNTS_SORTED], dtype=np.float64)
+
+# Exact powers of ten for the fast decimal-to-float path
+_POW10 = np.array([10.0 ** i for i in range(23)], dtype=np.float64)
+
+_f8 = types.float64
+_f4_1d = types.Array(types.float32, 1, 'C')
+_f8_1d = types.Array(types.float64, 1, 'C')
+_bytes = types.Array(types.uint8, 1, 'C', readonly=True)
+
+# Explicit signatures so the kernels are compiled at import, not on the first tick.
+# Book levels are float32; cumulative sizes and all scalars stay float64.
+COMPUTE_ALL_SIG = types.UniTuple(_f8, 4)(
+    _f4_1d, _f8_1d, _f8_1d, _f8, _f8, _f8, _f8, _f8, _f8, _f8
+)
+PARSE_LEVELS_SIG = types.int64(_bytes, _f4_1d, _f4_1d)
+WALK_ASKS_SIG = types.UniTuple(_f8, 2)(_f4_1d, _f8_1d, _f8_1d, _f8)
+SLIPPAGE_SIG = _f8(_f4_1d, _f8_1d, _f8_1d, _f8, _f8, _f8, _f8)
+FEES_SIG = _f8(_f8, _f8, _f8, _f8)
+MARKET_IMPACT_SIG = _f8(_f8, _f8, _f8)
+MAKER_TAKER_RATIO_SIG = _f8(_f8, _f8)
+
+
+@njit(PARSE_LEVELS_SIG, cache=True)
+def parse_levels(blob, out_px, out_sz):
+    """Parse a raw JSON array of [price, size] pairs into preallocated arrays
+
+    Returns the number of levels in the blob, or -1 if it is not an array of
+    two-number arrays. Levels beyond the capacity of the output arrays are
+    counted but not written, so the caller can grow the buffers and parse
+    again.
+    """
+    n = blob.shape[0]
+    capacity = out_px.shape[0]
+    depth = 0        # 1 inside the outer array, 2 inside a level
+    closed = False   # Outer array has been closed
+    count = 0        # Complete levels seen so far
+    fields = 0       # Numbers seen in the current level
+    i = 0
+    while i < n:
+        c = blob[i]
+        # Whitespace and commas only separate tokens
+        if c == 32 or c == 9 or c == 10 or c == 13 or c == 44:
+            i += 1
+            continue
+        if closed:
+            return -1  # Anything after the outer array
+
+        if c == 91:  # '['
+            if depth == 2:
+                return -1
+            depth += 1
+            fields = 0
+            i += 1
+            continue
+        if c == 93:  # ']'
+            if depth == 0:
+                return -1
+            if depth == 2:
+                if fields != 2:
+                    return -1
+                count += 1
+            else:
+                closed = True
+            depth -= 1
+            i += 1
+            continue
+
+        # Anything else must be a (possibly quoted) number inside a level
+        if depth != 2 or fields == 2:
+            return -1
+        quoted = c == 34  # '"'
+        if quoted:
+            i += 1
+
+        negative = i < n and blob[i] == 45  # '-'
+        if negative:
+            i += 1
+
+        mantissa = 0
+        exponent = 0
+        digits = 0
+        seen_digit = False
+        seen_dot = False
+        while i < n:
+            c = blob[i]
+            if 48 <= c <= 57:  # '0'-'9'
+                seen_digit = True
+                if digits < 18:
+                    mantissa = mantissa * 10 + (c - 48)
+                    # Leading zeros carry no precision, so only count from the first non-zero
+                    if mantissa != 0:
+                        digits += 1
+                    if seen_dot:
+                        exponent -= 1
+                elif not seen_dot:
+                    exponent += 1
+            elif c == 46 and not seen_dot:  # '.'
+                seen_dot = True
+            else:
+                break
+            i += 1
+        if not seen_digit:
+            return -1
+
+        if i < n and (blob[i] == 101 or blob[i] == 69):  # 'e', 'E'
+            i += 1
+            exp_negative = False
+            if i < n and (blob[i] == 45 or blob[i] == 43):  # '-', '+'
+                exp_negative = blob[i] == 45
+                i += 1
+            if i >= n or blob[i] < 48 or blob[i] > 57:
+                return -1
+            exp_value = 0
+            while i < n and 48 <= blob[i] <= 57:
+                exp_value = exp_value * 10 + (blob[i] - 48)
+                i += 1
+            exponent += -exp_value if exp_negative else exp_value
+
+        if quoted:
+            if i >= n or blob[i] != 34:
+                return -1
+            i += 1
+
+        value = np.float64(mantissa)
+        if 0 <= exponent <= 22:
+            value *= _POW10[exponent]
+        elif -22 <= exponent < 0:
+            value /= _POW10[-exponent]
+        else:
+            value *= 10.0 ** exponent
+        if negative:
+            value = -value
+
+        if count < capacity:
+            if fields == 1:
+                out_sz[count] = value
+            else:
+                out_px[count] = value
+        fields += 1
+
+    if not closed:
+        return -1
+    return count
+
+
+@njit(WALK_ASKS_SIG, cache=True, fastmath=True)
+def walk_asks(ask_px, ask_cumsz, ask_cum_notional, quantity):
+    """Walk the asks for a market buy and return (total_cost, executed_qty)"""
+    # First level whose cumulative size covers the order
+    k = np.searchsorted(ask_cumsz, quantity)
+
+    # Levels before k are taken in full
+    filled = ask_cumsz[k - 1] if k > 0 else 0.0
+    total_cost = ask_cum_notional[k - 1] if k > 0 else 0.0
+
+    if k == ask_px.shape[0]:
+        # Book exhausted before the order was filled
+        return total_cost, filled
+
+    total_cost += np.float64(ask_px[k]) * (quantity - filled)
+    return total_cost, quantity
+
+
+@njit(SLIPPAGE_SIG, cache=True, fastmath=True)
+def calculate_slippage(ask_px, ask_cumsz, ask_cum_notional, penalty_ask,
+                       mid_price, market_depth, quantity):
+    """Expected slippage of a market buy using linear regression model"""
+    if quantity <= 0:
+        return 0.0
+
+    total_cost, executed_qty = walk_asks(ask_px, ask_cumsz, ask_cum_notional, quantity)
+    if executed_qty < quantity:
+        # Not enough liquidity, fill the remainder at the penalty price
+        total_cost += penalty_ask * (quantity - executed_qty)
+
+    # (avg_execution_price - mid_price) / mid_price with a single division
+    slippage_pct = total_cost / (quantity * mid_price) - 1.0
+
+    volume_factor = sqrt(quantity / market_depth) if market_depth > 0 else 1.0
+    model_slippage = _SLIPPAGE_ALPHA + _SLIPPAGE_BETA * volume_factor
+    return max(slippage_pct, model_slippage)
+
+
+@njit(FEES_SIG, cache=True, fastmath=True)
+def calculate_fees(mid_price, maker_ratio, quantity, fee_tier):
+    """Expected fees as a fraction of order value, with volume and tier discounts"""
+    # Notional is only needed to pick the volume discount tier
+    notional = quantity * mid_price
+    discount = 0.0
+    for i in range(_DISCOUNT_THRESHOLDS.shape[0]):
+        if notional > _DISCOUNT_THRESHOLDS[i]:
+            discount = _DISCOUNT_RATES[i]
+            break
+    total_discount = min(0.7, discount + fee_tier * 0.05)
+    return (MAKER_FEE * maker_ratio + TAKER_FEE * (1 - maker_ratio)) * (1 - total_discount)
+
+
+@njit(MARKET_IMPACT_SIG, cache=True, fastmath=True)
+def calculate_market_impact(market_depth, quantity, volatility):
+    """Expected market impact using Almgren-Chriss model"""
+    trading_rate = quantity / market_depth if market_depth > 0 else 1.0
+    temp_impact = volatility * (trading_rate ** _AC_ALPHA)
+    perm_impact = _AC_GAMMA * volatility * sqrt(trading_rate)
+    return temp_impact + 0.5 * perm_impact
+
+
+@njit(MAKER_TAKER_RATIO_SIG, cache=True, fastmath=True)
+def predict_maker_taker_ratio(bid_volume, ask_volume):
+    """Maker ratio via logistic regression on order book imbalance"""
+    if bid_volume + ask_volume == 0:
+        return 0.5
+    imbalance = (bid_volume - ask_volume) / (bid_volume + ask_volume)
+    return 1.0 / (1.0 + exp(-_MT_K * imbalance))
+
+
+@njit(COMPUTE_ALL_SIG, cache=True, fastmath=True, nogil=True)
+def compute_all(ask_px, ask_cumsz, ask_cum_notional, penalty_ask, mid_price,
+                market_depth, maker_ratio, quantity, volatility, fee_tier):
+    """Return (slippage, fees, market_impact, maker_ratio) from the cached book statistics"""
+    # mid_price is zero when either side of the book is empty
+    if ask_px.shape[0] == 0 or mid_price <= 0:
+        return 0.0, 0.0, 0.0, 0.5
+
+    slippage = calculate_slippage(
+        ask_px, ask_cumsz, ask_cum_notional, penalty_ask, mid_price, market_depth, quantity
+    )
+    fees = calculate_fees(mid_price, maker_ratio, quantity, fee_tier)
+    market_impact = calculate_market_impact(market_depth, quantity, volatility)
+
+    return slippage, fees, market_impact, maker_ratio
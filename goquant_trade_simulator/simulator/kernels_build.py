@@ -0,0 +1,41 @@
+"""
+Ahead-of-time build of the Numba kernels.
+
+Run ``python -m simulator.kernels_build`` from the project root to compile
+``simulator/_kernels`` as a native extension. The build embeds a stamp of
+kernels.py and the settings; while it matches, the kernels are imported from
+it, so startup pays no JIT compilation at all. Otherwise ``simulator.kernels``
+is compiled (or loaded from Numba's cache) at import.
+
+numba.pycc is deprecated upstream and emits a NumbaPendingDeprecationWarning
+during the build; the JIT path does not depend on it.
+"""
+import os
+from numba.pycc import CC
+from simulator import kernels
+from simulator.kernel_stamp import source_stamp
+
+cc = CC("_kernels")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Export the pure-Python bodies under the same signatures the JIT uses
+cc.export("compute_all", kernels.COMPUTE_ALL_SIG)(kernels.compute_all.py_func)
+cc.export("parse_levels", kernels.PARSE_LEVELS_SIG)(kernels.parse_levels.py_func)
+cc.export("walk_asks", kernels.WALK_ASKS_SIG)(kernels.walk_asks.py_func)
+cc.export("calculate_slippage", kernels.SLIPPAGE_SIG)(kernels.calculate_slippage.py_func)
+cc.export("calculate_fees", kernels.FEES_SIG)(kernels.calculate_fees.py_func)
+cc.export("calculate_market_impact", kernels.MARKET_IMPACT_SIG)(kernels.calculate_market_impact.py_func)
+cc.export("predict_maker_taker_ratio", kernels.MAKER_TAKER_RATIO_SIG)(
+    kernels.predict_maker_taker_ratio.py_func
+)
+
+# Checked by kernel_loader so a build from older sources is never used
+_SOURCE_STAMP = source_stamp()
+
+def _source_stamp():
+    return _SOURCE_STAMP
+
+cc.export("source_stamp", "i8()")(_source_stamp)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,38 @@
+from collections import deque
+
+class LatencyWindow:
+    """Rolling mean and max latency over the last N latency reports"""
+    
+    def __init__(self, size=100):
+        # (total ms, sample count) per report; the deque evicts the oldest when full
+        self._reports = deque(maxlen=size)
+        self._total = 0.0
+        self._samples = 0
+        # (report index, max latency) with decreasing maxima; the front is the window max
+        self._maxima = deque()
+        self._index = 0
+        self.mean = 0.0
+        self.max = 0.0
+        
+    def push(self, mean_ms, max_ms, count):
+        """Add one report of count samples and update mean and max"""
+        if len(self._reports) == self._reports.maxlen:
+            old_total, old_count = self._reports[0]
+            self._total -= old_total
+            self._samples -= old_count
+        total = mean_ms * count
+        self._reports.append((total, count))
+        self._total += total
+        self._samples += count
+        
+        # Sliding-window max over the same reports as the mean
+        while self._maxima and self._maxima[-1][1] <= max_ms:
+            self._maxima.pop()
+        self._maxima.append((self._index, max_ms))
+        if self._maxima[0][0] <= self._index - self._reports.maxlen:
+            self._maxima.popleft()
+        self._index += 1
+        
+        # Weighted by sample count, so busy intervals count for more than quiet ones
+        self.mean = self._total / self._samples
+        self.max = self._maxima[0][1]
@@ -1,149 +1,135 @@
 import numpy as np
-from config.settings import (
-    MAKER_FEE, TAKER_FEE, VOLUME_DISCOUNTS,
-    MARKET_IMPACT_PARAMS, MAKER_TAKER_PARAMS
-)
+from .kernel_loader import kernels
+
+# Initial per-side level capacity; buffers grow if a deeper book arrives
+_INITIAL_LEVELS = 512
 
 class OrderBookProcessor:
     def __init__(self):
-        self.asks = []
-        self.bids = []
+        # Preallocated (price, size) rows per side, reused across updates. Each
+        # update is parsed into the spare buffers, which are swapped in only once
+        # both sides parse, so a bad frame leaves the current book untouched.
+        self._ask_levels = np.empty((2, _INITIAL_LEVELS), dtype=np.float32)
+        self._bid_levels = np.empty((2, _INITIAL_LEVELS), dtype=np.float32)
+        self._ask_spare = np.empty((2, _INITIAL_LEVELS), dtype=np.float32)
+        self._bid_spare = np.empty((2, _INITIAL_LEVELS), dtype=np.float32)
+        self.ask_px = self._ask_levels[0, :0]
+        self.ask_sz = self._ask_levels[1, :0]
+        self.bid_px = self._bid_levels[0, :0]
+        self.bid_sz = self._bid_levels[1, :0]
         self.timestamp = ""
         self.exchange = ""
         self.symbol = ""
+        # Bumped on every update so callers can tell whether the book changed
+        self.revision = 0
+        self._update_statistics()
         
     def update_orderbook(self, data):
-        self.timestamp = data["timestamp"]
-        self.exchange = data["exchange"]
-        self.symbol = data["symbol"]
-        self.asks = [[float(price), float(size)] for price, size in data["asks"]]
-        self.bids = [[float(price), float(size)] for price, size in data["bids"]]
+        # Struct-of-arrays layout, parsed from the raw JSON straight into the
+        # preallocated buffers without creating per-level Python objects.
+        # Raises ValueError, with the current book unchanged, if either side is malformed.
+        asks, n_asks = self._parse_levels(data.asks, self._ask_spare)
+        bids, n_bids = self._parse_levels(data.bids, self._bid_spare)
+        self._ask_spare, self._ask_levels = self._ask_levels, asks
+        self._bid_spare, self._bid_levels = self._bid_levels, bids
+        
+        self.timestamp = data.timestamp
+        self.exchange = data.exchange
+        self.symbol = data.symbol
+        self.ask_px = self._ask_levels[0, :n_asks]
+        self.ask_sz = self._ask_levels[1, :n_asks]
+        self.bid_px = self._bid_levels[0, :n_bids]
+        self.bid_sz = self._bid_levels[1, :n_bids]
+        
+        self._update_statistics()
+        self.revision += 1
     
-    def calculate_slippage(self, quantity, order_type="market"):
-        """Calculate expected slippage using linear regression model"""
-        if not self.asks or not self.bids:
-            return 0.0
+    @staticmethod
+    def _parse_levels(raw, levels):
+        """Parse raw [price, size] JSON into the levels buffer, growing it if needed"""
+        blob = np.frombuffer(raw, dtype=np.uint8)
+        count = kernels.parse_levels(blob, levels[0], levels[1])
+        if count < 0:
+            raise ValueError("Order book levels must be an array of [price, size] pairs")
+        if count > levels.shape[1]:
+            levels = np.empty((2, max(count, 2 * levels.shape[1])), dtype=np.float32)
+            kernels.parse_levels(blob, levels[0], levels[1])
+        return levels, count
+    
+    def _update_statistics(self):
+        """Derive the per-book statistics shared by the metric calculations"""
+        # Cumulative ask size, searched by the slippage walk (kept in float64)
+        self.ask_cumsz = np.cumsum(self.ask_sz, dtype=np.float64)
+        
+        # Cumulative ask notional, so a fill's cost is a lookup rather than a sum
+        notional = np.multiply(self.ask_px, self.ask_sz, dtype=np.float64)
+        self.ask_cum_notional = np.cumsum(notional, out=notional)
+        
+        # Fill price for any quantity beyond the visible asks
+        self.penalty_ask = float(self.ask_px[-1]) * 1.05 if self.ask_px.size else 0.0  # 5% penalty
+        
+        if self.ask_px.size == 0 or self.bid_px.size == 0:
+            self.mid_price = 0.0
+            self.ask_depth10 = 0.0
+            self.bid_vol5 = 0.0
+            self.ask_vol5 = 0.0
+            self.maker_ratio = 0.5  # Default 50/50
+            return
             
-        mid_price = (self.asks[0][0] + self.bids[0][0]) / 2
+        self.mid_price = (float(self.ask_px[0]) + float(self.bid_px[0])) / 2
         
-        if quantity <= 0:
-            return 0.0
-            
-        # Simple order book traversal for market orders
-        executed_qty = 0
-        total_cost = 0
+        # Market depth (sum of visible liquidity in first 10 levels), read off
+        # the cumulative sizes along with the ask top-of-book volume
+        self.ask_depth10 = float(self.ask_cumsz[min(10, self.ask_cumsz.size) - 1])
+        self.ask_vol5 = float(self.ask_cumsz[min(5, self.ask_cumsz.size) - 1])
+        self.bid_vol5 = float(self.bid_sz[:5].sum(dtype=np.float64))
         
-        if order_type == "market":
-            # For a buy order, we walk up the asks
-            for price, size in self.asks:
-                if executed_qty >= quantity:
-                    break
-                    
-                usable_size = min(size, quantity - executed_qty)
-                total_cost += price * usable_size
-                executed_qty += usable_size
-                
-            if executed_qty < quantity:
-                # Not enough liquidity in the order book
-                # Apply a penalty for the remaining quantity
-                penalty_price = self.asks[-1][0] * 1.05  # 5% penalty
-                total_cost += penalty_price * (quantity - executed_qty)
-                executed_qty = quantity
-                
-            avg_execution_price = total_cost / quantity
-            slippage_pct = (avg_execution_price - mid_price) / mid_price
-            
-            # Apply regression model
-            # slippage = α + β × f(volume_factor, price_difference)
-            alpha = 0.0001  # Base slippage component (0.01%)
-            beta = 0.02     # Volume coefficient
-            
-            # Calculate market depth (sum of visible liquidity in first 10 levels)
-            market_depth = sum(size for _, size in self.asks[:10])
-            volume_factor = np.sqrt(quantity / market_depth) if market_depth > 0 else 1
-            
-            model_slippage = alpha + beta * volume_factor
-            
-            # Final slippage is max of simple calculation and model
-            return max(slippage_pct, model_slippage)
-        
-        return 0.0
+        self.maker_ratio = kernels.predict_maker_taker_ratio(self.bid_vol5, self.ask_vol5)
+    
+    def snapshot(self):
+        """Return the compute_all book arguments, safe to use off the GUI thread"""
+        # The level buffers are overwritten in place by the next update, so copy
+        # them; the cumulative arrays are freshly allocated per update
+        return (
+            self.ask_px.copy(), self.ask_cumsz, self.ask_cum_notional,
+            float(self.penalty_ask), self.mid_price, self.ask_depth10, self.maker_ratio
+        )
+    
+    def compute_all(self, quantity, volatility=0.01, fee_tier=0):
+        """Calculate all trading metrics in one kernel call"""
+        slippage, fees, market_impact, maker_ratio = kernels.compute_all(
+            self.ask_px, self.ask_cumsz, self.ask_cum_notional, float(self.penalty_ask),
+            self.mid_price, self.ask_depth10, self.maker_ratio,
+            float(quantity), float(volatility), float(fee_tier)
+        )
+        return {
+            "slippage": slippage,
+            "fees": fees,
+            "market_impact": market_impact,
+            "maker_ratio": maker_ratio,
+        }
+    
+    def calculate_slippage_market(self, quantity):
+        """Calculate expected slippage of a market buy using linear regression model"""
+        if self.ask_px.size == 0 or self.bid_px.size == 0:
+            return 0.0
+        return kernels.calculate_slippage(
+            self.ask_px, self.ask_cumsz, self.ask_cum_notional, float(self.penalty_ask),
+            self.mid_price, self.ask_depth10, float(quantity)
+        )
     
     def calculate_fees(self, quantity, fee_tier=0):
         """Calculate expected fees based on fee tier"""
-        if not self.asks or not self.bids:
+        if self.ask_px.size == 0 or self.bid_px.size == 0:
             return 0.0
-            
-        mid_price = (self.asks[0][0] + self.bids[0][0]) / 2
-        order_value = quantity * mid_price
-        
-        # Apply volume-based discounts
-        discount = 0.0
-        for volume_threshold, volume_discount in sorted(VOLUME_DISCOUNTS.items(), reverse=True):
-            if order_value > volume_threshold:
-                discount = volume_discount
-                break
-            
-        # Apply fee tier adjustments (simplified)
-        tier_discount = fee_tier * 0.05  # Each tier gives 5% discount
-        total_discount = min(0.7, discount + tier_discount)  # Cap at 70% discount
-        
-        # Get predicted maker/taker ratio
-        maker_ratio = self.predict_maker_taker_ratio()
-        
-        # Calculate weighted average fee
-        weighted_fee = (MAKER_FEE * maker_ratio + TAKER_FEE * (1 - maker_ratio)) * (1 - total_discount)
-        total_fee = weighted_fee * order_value
-        
-        return total_fee / order_value  # Return as percentage of order value
+        return kernels.calculate_fees(self.mid_price, self.maker_ratio, float(quantity), float(fee_tier))
     
     def calculate_market_impact(self, quantity, volatility=0.01):
         """Calculate expected market impact using Almgren-Chriss model"""
-        if not self.asks or not self.bids:
+        if self.ask_px.size == 0 or self.bid_px.size == 0:
             return 0.0
-            
-        mid_price = (self.asks[0][0] + self.bids[0][0]) / 2
-        
-        # Almgren-Chriss model parameters
-        sigma = volatility  # Price volatility
-        gamma = MARKET_IMPACT_PARAMS['gamma']
-        eta = MARKET_IMPACT_PARAMS['eta']
-        alpha = MARKET_IMPACT_PARAMS['alpha']
-        
-        # Calculate market depth
-        market_depth = sum(size for _, size in self.asks[:10])
-        
-        # Calculate trading rate (simplified as quantity / market depth)
-        trading_rate = quantity / market_depth if market_depth > 0 else 1
-        
-        # Temporary impact
-        temp_impact = sigma * (trading_rate ** alpha)
-        
-        # Permanent impact
-        perm_impact = gamma * sigma * np.sqrt(trading_rate)
-        
-        # Total impact (weighted sum)
-        total_impact = temp_impact + 0.5 * perm_impact
-        
-        return total_impact
+        return kernels.calculate_market_impact(self.ask_depth10, float(quantity), float(volatility))
     
     def predict_maker_taker_ratio(self):
         """Predict maker/taker ratio using logistic regression on order book imbalance"""
-        if not self.asks or not self.bids:
-            return 0.5  # Default 50/50
-            
-        # Calculate bid/ask volume imbalance
-        bid_volume = sum(size for _, size in self.bids[:5])
-        ask_volume = sum(size for _, size in self.asks[:5])
-        
-        if bid_volume + ask_volume == 0:
-            return 0.5
-            
-        imbalance = (bid_volume - ask_volume) / (bid_volume + ask_volume)
-        
-        # Apply logistic function
-        k = MAKER_TAKER_PARAMS['k']
-        x0 = MAKER_TAKER_PARAMS['x0']
-        maker_ratio = 1 / (1 + np.exp(-k * (imbalance - x0)))
-        
-        return maker_ratio 
\ No newline at end of file
+        return self.maker_ratio
\ No newline at end of file
@@ -0,0 +1,29 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from .kernel_loader import kernels
+
+class SimulationSignals(QObject):
+    # QRunnable isn't a QObject, so its signals live here
+    result_ready = pyqtSignal(int, dict)
+
+class SimulationWorker(QRunnable):
+    """Runs the fused metrics kernel on a QThreadPool thread"""
+    
+    def __init__(self, request_id, book, quantity, volatility, fee_tier):
+        super().__init__()
+        self.request_id = request_id
+        self.book = book
+        self.quantity = float(quantity)
+        self.volatility = float(volatility)
+        self.fee_tier = float(fee_tier)
+        self.signals = SimulationSignals()
+        
+    def run(self):
+        slippage, fees, market_impact, maker_ratio = kernels.compute_all(
+            *self.book, self.quantity, self.volatility, self.fee_tier
+        )
+        self.signals.result_ready.emit(self.request_id, {
+            "slippage": slippage,
+            "fees": fees,
+            "market_impact": market_impact,
+            "maker_ratio": maker_ratio,
+        })
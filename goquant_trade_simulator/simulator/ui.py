@@ -1,12 +1,14 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QLabel, QComboBox, QDoubleSpinBox, QPushButton,
                             QGroupBox, QGridLayout, QLineEdit)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QThreadPool, QTimer
 from config.settings import (
     WINDOW_TITLE, WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT,
     UI_UPDATE_INTERVAL, WS_URL, DEFAULT_FEE_TIER, DEFAULT_VOLATILITY
 )
 from .processor import OrderBookProcessor
+from .simulation_worker import SimulationWorker
+from .latency_window import LatencyWindow
 from .websocket_thread import WebSocketThread
 
 class TradeSimulatorUI(QMainWindow):
@@ -19,23 +21,33 @@ class TradeSimulatorUI(QMainWindow):
         self.processor = OrderBookProcessor()
         
         # Initialize performance metrics
-        self.latency_values = []
+        self.latency_window = LatencyWindow(100)
         self.max_latency = 0
         self.avg_latency = 0
         
+        # Id of the latest simulation request; older results are discarded
+        self._simulation_id = 0
+        # (revision, quantity, volatility, fee_tier) of the last result shown
+        self._pending_simulation_key = None
+        self._last_simulation_key = None
+        self._last_simulation_result = None
+        
         # Set up the UI
         self.setup_ui()
         
+        # Single-shot refresh, armed only when new data arrives, so the order book
+        # is processed at most once per UI_UPDATE_INTERVAL and never while idle
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(UI_UPDATE_INTERVAL)
+        self.refresh_timer.timeout.connect(self.update_ui)
+        
         # Start WebSocket connection
         self.ws_thread = WebSocketThread(WS_URL)
-        self.ws_thread.data_received.connect(self.on_data_received)
         self.ws_thread.latency_updated.connect(self.on_latency_updated)
+        self.ws_thread.connection_status_changed.connect(self.on_connection_status_changed)
+        self.ws_thread.data_ready.connect(self.on_data_ready)
         self.ws_thread.start()
-        
-        # Set up a timer to update UI periodically
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_ui)
-        self.timer.start(UI_UPDATE_INTERVAL)
     
     def setup_ui(self):
         central_widget = QWidget()
@@ -150,24 +162,21 @@ class TradeSimulatorUI(QMainWindow):
         self.processor.update_orderbook(data)
         
         # Update connection status
-        self.connection_status.setText(f"Connection Status: Connected to {data['exchange']} {data['symbol']}")
+        self._set_text(self.connection_status, f"Connection Status: Connected to {data.exchange} {data.symbol}")
         
         # Update orderbook status
-        num_asks = len(data["asks"])
-        num_bids = len(data["bids"])
-        self.orderbook_status.setText(f"Order Book: {num_bids} bids, {num_asks} asks")
+        num_asks = self.processor.ask_px.size
+        num_bids = self.processor.bid_px.size
+        self._set_text(self.orderbook_status, f"Order Book: {num_bids} bids, {num_asks} asks")
     
-    def on_latency_updated(self, latency_ms):
-        # Update latency metrics
-        self.latency_values.append(latency_ms)
-        if len(self.latency_values) > 100:
-            self.latency_values.pop(0)
-            
-        self.max_latency = max(self.max_latency, latency_ms)
-        self.avg_latency = sum(self.latency_values) / len(self.latency_values)
+    def on_latency_updated(self, mean_ms, max_ms, count):
+        # Update latency metrics over the last 100 reports
+        self.latency_window.push(mean_ms, max_ms, count)
+        self.max_latency = self.latency_window.max
+        self.avg_latency = self.latency_window.mean
         
         # Update latency display
-        self.latency_output.setText(f"{self.avg_latency:.2f} ms (max: {self.max_latency:.2f} ms)")
+        self._set_text(self.latency_output, f"{self.avg_latency:.2f} ms (max: {self.max_latency:.2f} ms)")
     
     def on_simulate_clicked(self):
         # Get input parameters
@@ -175,29 +184,70 @@ class TradeSimulatorUI(QMainWindow):
         volatility = self.volatility_spin.value()
         fee_tier = self.fee_tier_spin.value()
         
-        # Calculate outputs
-        slippage = self.processor.calculate_slippage(quantity)
-        fees = self.processor.calculate_fees(quantity, fee_tier)
-        market_impact = self.processor.calculate_market_impact(quantity, volatility)
+        self._simulation_id += 1
+        self._pending_simulation_key = (self.processor.revision, quantity, volatility, fee_tier)
+        
+        # Same book and inputs as the last run, reuse its result
+        if self._pending_simulation_key == self._last_simulation_key:
+            self.on_simulation_finished(self._simulation_id, self._last_simulation_result)
+            return
+        
+        # Run the calculation on the thread pool to keep the GUI thread free
+        worker = SimulationWorker(
+            self._simulation_id, self.processor.snapshot(), quantity, volatility, fee_tier
+        )
+        worker.signals.result_ready.connect(self.on_simulation_finished)
+        QThreadPool.globalInstance().start(worker)
+    
+    def on_simulation_finished(self, request_id, results):
+        # A newer request was submitted while this one was running
+        if request_id != self._simulation_id:
+            return
+        self._last_simulation_key = self._pending_simulation_key
+        self._last_simulation_result = results
+        
+        slippage = results["slippage"]
+        fees = results["fees"]
+        market_impact = results["market_impact"]
+        maker_ratio = results["maker_ratio"]
         
         # Calculate net cost
         net_cost = slippage + fees + market_impact
         
-        # Calculate maker/taker ratio
-        maker_ratio = self.processor.predict_maker_taker_ratio()
         taker_ratio = 1 - maker_ratio
         
         # Update output displays
-        self.slippage_output.setText(f"{slippage*100:.4f}%")
-        self.fees_output.setText(f"{fees*100:.4f}%")
-        self.impact_output.setText(f"{market_impact*100:.4f}%")
-        self.net_cost_output.setText(f"{net_cost*100:.4f}%")
-        self.maker_taker_output.setText(f"{maker_ratio*100:.1f}% / {taker_ratio*100:.1f}%")
+        self._set_text(self.slippage_output, f"{slippage*100:.4f}%")
+        self._set_text(self.fees_output, f"{fees*100:.4f}%")
+        self._set_text(self.impact_output, f"{market_impact*100:.4f}%")
+        self._set_text(self.net_cost_output, f"{net_cost*100:.4f}%")
+        self._set_text(self.maker_taker_output, f"{maker_ratio*100:.1f}% / {taker_ratio*100:.1f}%")
+    
+    def on_data_ready(self):
+        # Frames arriving before the timer fires just replace the pending one
+        if not self.refresh_timer.isActive():
+            self.refresh_timer.start()
     
     def update_ui(self):
-        # Update connection status if WebSocket is disconnected
-        if not self.ws_thread.connection_active:
-            self.connection_status.setText("Connection Status: Disconnected (attempting to reconnect)")
+        # Process only the most recent order book; older frames were dropped
+        data = self.ws_thread.take_latest()
+        if data is None:
+            return
+        try:
+            self.on_data_received(data)
+        except ValueError as e:
+            # Malformed levels; update_orderbook left the previous book in place
+            print(f"Error processing order book: {e}")
+    
+    def on_connection_status_changed(self, connected):
+        # Connected status is shown by on_data_received once data arrives
+        if not connected:
+            self._set_text(self.connection_status, "Connection Status: Disconnected (attempting to reconnect)")
+    
+    def _set_text(self, widget, text):
+        # Skip setText, and the repaint it triggers, when the text is unchanged
+        if widget.text() != text:
+            widget.setText(text)
     
     def closeEvent(self, event):
         # Stop the WebSocket thread when window is closed
@@ -1,60 +1,158 @@
-import json
+import asyncio
 import time
-import websocket
+import threading
 import ssl
+import msgspec
+import websockets
+from websockets.asyncio.client import connect
 from PyQt5.QtCore import QThread, pyqtSignal
+from config.settings import UI_UPDATE_INTERVAL
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+class OrderBookMessage(msgspec.Struct):
+    """L2 order book snapshot as sent by the GoQuant feed"""
+    timestamp: str
+    exchange: str
+    symbol: str
+    # Raw JSON of the [price, size] arrays, parsed (and validated) by
+    # kernels.parse_levels only for the frame the UI actually processes
+    asks: msgspec.Raw
+    bids: msgspec.Raw
+
+# Decodes straight into the struct, skipping the intermediate dict
+_decoder = msgspec.json.Decoder(OrderBookMessage)
+
+# Reconnect backoff bounds in seconds
+_RECONNECT_DELAY_MIN = 5
+_RECONNECT_DELAY_MAX = 60
 
 class WebSocketThread(QThread):
-    data_received = pyqtSignal(dict)
-    latency_updated = pyqtSignal(float)
+    # (mean ms, max ms, sample count) of processing latency, once per UI_UPDATE_INTERVAL
+    latency_updated = pyqtSignal(float, float, int)
+    connection_status_changed = pyqtSignal(bool)
+    # Emitted when the latest-value slot goes from empty to filled
+    data_ready = pyqtSignal()
     
     def __init__(self, url):
         super().__init__()
         self.url = url
         self.running = True
-        self.connection_active = False
+        # None until the first connect attempt, so an initial failure is reported too
+        self.connection_active = None
+        
+        # Latest order book only; the UI drops any frames it didn't get to
+        self._latest = None
+        self._lock = threading.Lock()
+        
+        # Latency samples aggregated since the last latency_updated emit
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_count = 0
         
     def run(self):
-        def on_message(ws, message):
-            start_time = time.time()
-            try:
-                data = json.loads(message)
-                self.connection_active = True
-                self.data_received.emit(data)
-                
-                # Calculate processing latency
-                processing_time = (time.time() - start_time) * 1000  # in ms
-                self.latency_updated.emit(processing_time)
-            except Exception as e:
-                print(f"Error processing message: {e}")
+        # The thread owns its event loop; uvloop is used when available
+        loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._connect())
+        finally:
+            loop.close()
+        
+    def on_message(self, message):
+        start_ns = time.perf_counter_ns()
+        try:
+            data = _decoder.decode(message)
+            self._set_connection_active(True)
+            with self._lock:
+                notify = self._latest is None
+                self._latest = data
+            
+            # At most one pending notification; later frames just replace the data
+            if notify:
+                self.data_ready.emit()
             
-        def on_error(ws, error):
-            print(f"WebSocket error: {error}")
-            self.connection_active = False
+            # Calculate processing latency
+            processing_time = (time.perf_counter_ns() - start_ns) * 1e-6  # in ms
+            self._record_latency(processing_time)
+        except Exception as e:
+            print(f"Error processing message: {e}")
         
-        def on_close(ws, close_status_code, close_msg):
-            print(f"WebSocket closed: {close_status_code} - {close_msg}")
-            self.connection_active = False
+    def on_error(self, error):
+        print(f"WebSocket error: {error}")
+        self._set_connection_active(False)
+    
+    def on_close(self, close_status_code, close_msg):
+        print(f"WebSocket closed: {close_status_code} - {close_msg}")
+        self._set_connection_active(False)
+    
+    def on_open(self):
+        print("WebSocket connection opened")
+        self._set_connection_active(True)
+        
+    async def _connect(self):
+        ssl_context = None
+        if self.url.startswith("wss://"):
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+        
+        delay = _RECONNECT_DELAY_MIN
+        while self.running:
+            try:
+                # permessage-deflate off: decompressing L2 frames costs more than the bandwidth saved.
+                # Keepalive pings detect a dead connection well before the next message is missed.
+                async with connect(self.url, ssl=ssl_context, compression=None,
+                                   ping_interval=20, ping_timeout=10) as ws:
+                    self.on_open()
+                    delay = _RECONNECT_DELAY_MIN
+                    try:
+                        while self.running:
+                            # Raw frame bytes go straight to msgspec, skipping the UTF-8 decode to str
+                            self.on_message(await ws.recv(decode=False))
+                    except websockets.ConnectionClosedOK:
+                        pass
+                self.on_close(ws.close_code, ws.close_reason)
+            except Exception as e:
+                self.on_error(e)
             
-            # Attempt to reconnect after a delay if thread is still running
+            # Attempt to reconnect with exponential backoff if thread is still running
             if self.running:
-                time.sleep(5)
-                self.connect_websocket()
-        
-        def on_open(ws):
-            print("WebSocket connection opened")
-            self.connection_active = True
-        
-        def connect_websocket():
-            wsapp = websocket.WebSocketApp(self.url,
-                                          on_open=on_open,
-                                          on_message=on_message,
-                                          on_error=on_error,
-                                          on_close=on_close)
-            wsapp.run_forever(sslopt={"cert_reqs": ssl.CERT_NONE})
-        
-        self.connect_websocket = connect_websocket
-        connect_websocket()
+                await asyncio.sleep(delay)
+                delay = min(_RECONNECT_DELAY_MAX, delay * 2)
+        
+    def _set_connection_active(self, active):
+        if active != self.connection_active:
+            self.connection_active = active
+            self.connection_status_changed.emit(active)
+        
+    def _record_latency(self, latency_ms):
+        # The first sample of an interval schedules its report, so a quiet feed
+        # schedules no wakeups and the last samples before a lull still go out
+        if self._latency_count == 0:
+            asyncio.get_running_loop().call_later(UI_UPDATE_INTERVAL / 1000, self._flush_latency)
+        self._latency_total += latency_ms
+        self._latency_max = max(self._latency_max, latency_ms)
+        self._latency_count += 1
+        
+    def _flush_latency(self):
+        # One signal per UI refresh instead of one per message
+        self.latency_updated.emit(
+            self._latency_total / self._latency_count, self._latency_max, self._latency_count
+        )
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_count = 0
+        
+    def take_latest(self):
+        """Return the most recent order book (or None) and clear the slot"""
+        with self._lock:
+            data = self._latest
+            self._latest = None
+        return data
         
     def stop(self):
         self.running = False 
\ No newline at end of file
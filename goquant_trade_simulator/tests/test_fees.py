@@ -0,0 +1,50 @@
+import pytest
+
+from config.settings import MAKER_FEE, TAKER_FEE, VOLUME_DISCOUNTS, VOLUME_DISCOUNTS_SORTED
+from simulator import kernels
+
+MID_PRICE = 100.0
+
+
+def reference_fees(mid_price, maker_ratio, quantity, fee_tier):
+    # Original dict-based formula, including the multiply/divide by order value
+    order_value = quantity * mid_price
+    discount = 0.0
+    for volume_threshold, volume_discount in sorted(VOLUME_DISCOUNTS.items(), reverse=True):
+        if order_value > volume_threshold:
+            discount = volume_discount
+            break
+    total_discount = min(0.7, discount + fee_tier * 0.05)
+    weighted_fee = (MAKER_FEE * maker_ratio + TAKER_FEE * (1 - maker_ratio)) * (1 - total_discount)
+    total_fee = weighted_fee * order_value
+    return total_fee / order_value
+
+
+def order_values():
+    # Each discount threshold, just either side of it, and well clear of all of them
+    values = [1_000.0, 10 * max(VOLUME_DISCOUNTS)]
+    for threshold in VOLUME_DISCOUNTS:
+        values += [threshold - 0.01, float(threshold), threshold + 0.01]
+    return values
+
+
+def test_sorted_tiers_match_discount_table():
+    assert VOLUME_DISCOUNTS_SORTED == tuple(sorted(VOLUME_DISCOUNTS.items(), reverse=True))
+
+
+@pytest.mark.parametrize("fee_tier", [0, 1, 2, 3, 4, 5, 10, 12])
+@pytest.mark.parametrize("order_value", order_values())
+@pytest.mark.parametrize("maker_ratio", [0.0, 0.35, 1.0])
+def test_fees_match_original_formula(fee_tier, order_value, maker_ratio):
+    quantity = order_value / MID_PRICE
+    expected = reference_fees(MID_PRICE, maker_ratio, quantity, fee_tier)
+    actual = kernels.calculate_fees(MID_PRICE, maker_ratio, quantity, float(fee_tier))
+    assert actual == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize("threshold, discount", sorted(VOLUME_DISCOUNTS.items()))
+def test_discount_applies_only_above_threshold(threshold, discount):
+    at = kernels.calculate_fees(MID_PRICE, 0.0, threshold / MID_PRICE, 0.0)
+    above = kernels.calculate_fees(MID_PRICE, 0.0, (threshold + 1) / MID_PRICE, 0.0)
+    assert above == pytest.approx(TAKER_FEE * (1 - discount), rel=1e-12)
+    assert at > above
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from simulator.latency_window import LatencyWindow
+
+
+def brute_force(reports, size):
+    window = reports[-size:]
+    samples = sum(count for _, _, count in window)
+    mean = sum(mean_ms * count for mean_ms, _, count in window) / samples
+    return mean, max(max_ms for _, max_ms, _ in window)
+
+
+@pytest.mark.parametrize("size", [1, 3, 100])
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force_over_random_reports(size, seed):
+    rng = random.Random(seed)
+    window = LatencyWindow(size)
+    reports = []
+    for _ in range(1000):
+        count = rng.randint(1, 500)
+        mean_ms = rng.uniform(0.01, 1.0)
+        # Occasional spikes, and runs of equal or falling maxima to exercise eviction
+        max_ms = mean_ms + rng.choice([0.0, rng.uniform(0, 1), rng.uniform(10, 50)])
+        reports.append((mean_ms, max_ms, count))
+        window.push(mean_ms, max_ms, count)
+
+        expected_mean, expected_max = brute_force(reports, size)
+        assert window.mean == pytest.approx(expected_mean, rel=1e-9)
+        assert window.max == expected_max
+
+
+def test_spike_expires_after_window():
+    window = LatencyWindow(100)
+    window.push(0.5, 30.0, 100)
+    for _ in range(99):
+        window.push(0.02, 0.03, 100)
+    assert window.max == 30.0
+    window.push(0.02, 0.03, 100)
+    assert window.max == 0.03
+
+
+def test_mean_is_weighted_by_sample_count():
+    window = LatencyWindow(100)
+    window.push(1.0, 1.0, 1)
+    window.push(0.1, 0.1, 99)
+    assert window.mean == pytest.approx((1.0 + 0.1 * 99) / 100)
@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from simulator import kernels
+from simulator.processor import OrderBookProcessor
+
+
+def parse(blob, capacity=8):
+    px = np.zeros(capacity, dtype=np.float32)
+    sz = np.zeros(capacity, dtype=np.float32)
+    count = kernels.parse_levels(np.frombuffer(blob, dtype=np.uint8), px, sz)
+    return count, px[:max(count, 0)], sz[:max(count, 0)]
+
+
+def book(asks, bids):
+    return SimpleNamespace(timestamp="t", exchange="OKX", symbol="BTC-USDT", asks=asks, bids=bids)
+
+
+def test_parses_quoted_and_bare_pairs():
+    count, px, sz = parse(b'[["95000.1", "0.25"], [95000.2,1.5]]')
+    assert count == 2
+    np.testing.assert_allclose(px, [95000.1, 95000.2], rtol=1e-7)
+    np.testing.assert_allclose(sz, [0.25, 1.5], rtol=1e-7)
+
+
+@pytest.mark.parametrize("blob", [b"[]", b" [ ]\n"])
+def test_empty_side(blob):
+    assert parse(blob)[0] == 0
+
+
+@pytest.mark.parametrize("text, expected", [
+    (b"1e3", 1000.0),
+    (b"2.5E-2", 0.025),
+    (b"1.5e+2", 150.0),
+    (b"-2.5", -2.5),
+    (b"-1e-3", -0.001),
+    (b"0.000000000000000000001234", 1.234e-21),
+    (b"123456789012345678901", 1.2345678901234568e20),
+])
+def test_number_forms(text, expected):
+    count, px, sz = parse(b'[["' + text + b'", ' + text + b']]')
+    assert count == 1
+    np.testing.assert_allclose([px[0], sz[0]], [expected, expected], rtol=1e-6)
+
+
+@pytest.mark.parametrize("blob", [
+    b'[["1.5",null]]',
+    b'[["95000.1","0.01","0","4"]]',  # OKX four-field level
+    b'[["1.5"]]',
+    b'[[]]',
+    b'["1.5","2"]',
+    b'[[["1.5","2"]]]',
+    b'[["1.5","2"]',
+    b'["1.5","2"]]',
+    b'[["","2"]]',
+    b'[["abc","2"]]',
+    b'[["1.5,"2"]]',
+    b'[["1e","2"]]',
+    b'[["1.5","2"]] x',
+    b'',
+])
+def test_rejects_malformed_levels(blob):
+    assert parse(blob)[0] == -1
+
+
+def test_counts_levels_beyond_capacity():
+    blob = b"[" + b",".join(b'["%d","1"]' % i for i in range(10)) + b"]"
+    count, px, _ = parse(blob, capacity=4)
+    assert count == 10
+    np.testing.assert_array_equal(px[:4], [0, 1, 2, 3])
+
+
+def test_processor_grows_past_initial_capacity():
+    processor = OrderBookProcessor()
+    levels = 1500
+    asks = b"[" + b",".join(b'["%d","0.5"]' % (100 + i) for i in range(levels)) + b"]"
+    processor.update_orderbook(book(asks, b'[["99","2"]]'))
+    assert processor.ask_px.size == levels
+    assert processor.ask_px[-1] == 100 + levels - 1
+    np.testing.assert_allclose(processor.ask_cumsz[-1], 0.5 * levels)
+    assert processor.bid_px.tolist() == [99.0]
+
+
+def test_processor_rejects_malformed_book():
+    processor = OrderBookProcessor()
+    with pytest.raises(ValueError):
+        processor.update_orderbook(book(b'[["1.5",null]]', b'[["1","2"]]'))
+
+
+def test_processor_keeps_book_when_one_side_is_malformed():
+    processor = OrderBookProcessor()
+    processor.update_orderbook(book(b'[["101","2"],["102","3"]]', b'[["100","1"]]'))
+    before = (processor.timestamp, processor.revision, processor.ask_px.tolist(),
+              processor.bid_px.tolist(), processor.ask_cumsz.tolist(), processor.mid_price)
+
+    bad = SimpleNamespace(timestamp="t2", exchange="OKX", symbol="BTC-USDT",
+                          asks=b'[["105","9"]]', bids=b'[["1.5",null]]')
+    with pytest.raises(ValueError):
+        processor.update_orderbook(bad)
+
+    after = (processor.timestamp, processor.revision, processor.ask_px.tolist(),
+             processor.bid_px.tolist(), processor.ask_cumsz.tolist(), processor.mid_price)
+    assert after == before
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from simulator import kernels
+from simulator.processor import OrderBookProcessor
+
+# Prices and sizes exactly representable in float32
+ASKS = [(100.5, 1.0), (101.25, 2.0), (102.0, 0.5), (104.75, 3.0)]
+BIDS = [(100.0, 1.5), (99.5, 2.0)]
+
+
+def encode(levels):
+    return ("[" + ",".join(f'["{px}","{sz}"]' for px, sz in levels) + "]").encode()
+
+
+@pytest.fixture
+def processor():
+    processor = OrderBookProcessor()
+    processor.update_orderbook(SimpleNamespace(
+        timestamp="t", exchange="OKX", symbol="BTC-USDT", asks=encode(ASKS), bids=encode(BIDS)
+    ))
+    return processor
+
+
+def naive_walk(quantity):
+    # Level-by-level walk up the asks, as in the original implementation
+    executed_qty = 0.0
+    total_cost = 0.0
+    for price, size in ASKS:
+        if executed_qty >= quantity:
+            break
+        usable_size = min(size, quantity - executed_qty)
+        total_cost += price * usable_size
+        executed_qty += usable_size
+    return total_cost, executed_qty
+
+
+def naive_slippage(quantity, mid_price, market_depth):
+    if quantity <= 0:
+        return 0.0
+    total_cost, executed_qty = naive_walk(quantity)
+    if executed_qty < quantity:
+        penalty_price = ASKS[-1][0] * 1.05
+        total_cost += penalty_price * (quantity - executed_qty)
+    slippage_pct = (total_cost / quantity - mid_price) / mid_price
+    volume_factor = np.sqrt(quantity / market_depth) if market_depth > 0 else 1
+    return max(slippage_pct, 0.0001 + 0.02 * volume_factor)
+
+
+CASES = {
+    "partial first level": 0.4,
+    "crosses several levels": 3.2,
+    "exact level boundary": 3.0,
+    "exact first level": 1.0,
+    "whole book": 6.5,
+    "book exhausted": 9.0,
+}
+
+
+@pytest.mark.parametrize("quantity", CASES.values(), ids=CASES.keys())
+def test_walk_asks_matches_naive_walk(processor, quantity):
+    total_cost, executed_qty = kernels.walk_asks(
+        processor.ask_px, processor.ask_cumsz, processor.ask_cum_notional, quantity
+    )
+    expected_cost, expected_qty = naive_walk(quantity)
+    assert total_cost == pytest.approx(expected_cost, rel=1e-12)
+    assert executed_qty == pytest.approx(expected_qty, rel=1e-12)
+
+
+@pytest.mark.parametrize("quantity", CASES.values(), ids=CASES.keys())
+def test_slippage_matches_naive_walk(processor, quantity):
+    mid_price = (ASKS[0][0] + BIDS[0][0]) / 2
+    market_depth = sum(size for _, size in ASKS[:10])
+    expected = naive_slippage(quantity, mid_price, market_depth)
+    assert processor.calculate_slippage_market(quantity) == pytest.approx(expected, rel=1e-12)
+    assert processor.compute_all(quantity)["slippage"] == pytest.approx(expected, rel=1e-12)
+
+
+def test_exhausted_book_fills_remainder_at_penalty(processor):
+    quantity = 9.0
+    book_qty = sum(size for _, size in ASKS)
+    book_cost = sum(px * sz for px, sz in ASKS)
+    assert processor.penalty_ask == pytest.approx(ASKS[-1][0] * 1.05)
+
+    total_cost, executed_qty = kernels.walk_asks(
+        processor.ask_px, processor.ask_cumsz, processor.ask_cum_notional, quantity
+    )
+    assert executed_qty == book_qty
+    assert total_cost == pytest.approx(book_cost, rel=1e-12)
+
+
+@pytest.mark.parametrize("quantity", [0.0, -1.0])
+def test_non_positive_quantity_has_no_slippage(processor, quantity):
+    assert processor.calculate_slippage_market(quantity) == 0.0
+    assert processor.compute_all(quantity)["slippage"] == 0.0